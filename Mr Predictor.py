@@ -2,16 +2,67 @@
 Mr. Predictor - Flask Web Trading Terminal
 ================================================
 Install dependencies: pip install flask pandas numpy yfinance flask-cors
+Optional binary formats for /api/data: pip install msgpack pyarrow
 Run: python app.py
 Access: http://localhost:5000
 """
 
-from flask import Flask, render_template_string, jsonify, request
+from flask import (Flask, Response, make_response, render_template_string, jsonify, request,
+                   stream_with_context)
 from flask_cors import CORS
-import pandas as pd
-import numpy as np
-import yfinance as yf
-from datetime import datetime
+import bisect
+import csv
+import functools
+import heapq
+import hmac
+import importlib
+import importlib.util
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, time as dtime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# ==============================================================================
+# LAZY IMPORTS
+# ==============================================================================
+
+class _LazyModule:
+    """Stand-in for a module that is imported on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def _optional_module(name):
+    if importlib.util.find_spec(name) is None:
+        return None
+    return _LazyModule(name)
+
+
+# pandas/numpy/yfinance dominate import time; defer them until a request needs them
+pd = _LazyModule("pandas")
+np = _LazyModule("numpy")
+yf = _LazyModule("yfinance")
+msgpack = _optional_module("msgpack")
+pa = _optional_module("pyarrow")
 
 app = Flask(__name__)
 CORS(app)
@@ -83,43 +134,627 @@ STOCK_LIST = {
     ]
 }
 
+# ==============================================================================
+# STOCK SEARCH INDEX
+# ==============================================================================
+
+# Optional CSV of full exchange listings (columns: ticker/symbol, name, category/exchange)
+LISTINGS_FILE = os.environ.get(
+    "MR_PREDICTOR_LISTINGS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "listings.csv")
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokenize(text):
+    return _TOKEN_RE.findall(text.lower())
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids", "ranked", "members")
+
+    def __init__(self):
+        self.children = {}
+        self.ids = []
+        # Built on first use: ids in result order for a query that is exactly
+        # this node's prefix, and the same ids as a set for intersections
+        self.ranked = None
+        self.members = None
+
+
+class StockIndex:
+    """Prefix trie over ticker and name tokens with bounded fuzzy fallback.
+
+    Entries get a static rank (shorter tickers first, then alphabetical) and
+    every trie node keeps its ids in that order, so a one-token prefix query
+    is a slice of a cached list instead of a sort over every hit.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self._tickers = []
+        self._names = []
+        self._root = _TrieNode()
+        self._known = set()
+        self._rank = None
+
+    def add(self, ticker, name, category=""):
+        ticker = ticker.strip().upper()
+        if not ticker or ticker in self._known:
+            return
+        self._known.add(ticker)
+        self._rank = None
+        idx = len(self.entries)
+        self.entries.append({"ticker": ticker, "name": name.strip(), "category": category})
+        self._tickers.append(ticker.lower())
+        self._names.append(name.strip().lower())
+
+        keys = set(_tokenize(ticker)) | set(_tokenize(name))
+        keys.add("".join(_tokenize(ticker)))
+        for key in keys:
+            node = self._root
+            for ch in key:
+                node = node.children.setdefault(ch, _TrieNode())
+                if not node.ids or node.ids[-1] != idx:
+                    node.ids.append(idx)
+                    node.ranked = node.members = None
+
+    def load_csv(self, path):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                row = {k.strip().lower(): (v or "") for k, v in row.items() if k}
+                ticker = row.get("ticker") or row.get("symbol") or ""
+                name = row.get("name") or row.get("security name") or ticker
+                category = row.get("category") or row.get("exchange") or ""
+                self.add(ticker, name, category)
+
+    def rank_entries(self):
+        """Compute the static rank and put every node's ids in rank order; call once loading is done."""
+        tickers = self._tickers
+        order = sorted(range(len(tickers)), key=lambda i: (len(tickers[i]), tickers[i]))
+        rank = [0] * len(order)
+        for position, idx in enumerate(order):
+            rank[idx] = position
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            node.ids.sort(key=rank.__getitem__)
+            node.ranked = node.members = None
+            stack.extend(node.children.values())
+        # Entries whose ticker or name starts with q form one bisectable run of these
+        self._by_ticker = sorted(range(len(tickers)), key=tickers.__getitem__)
+        self._ticker_keys = [tickers[i] for i in self._by_ticker]
+        self._by_name = sorted(range(len(self._names)), key=self._names.__getitem__)
+        self._name_keys = [self._names[i] for i in self._by_name]
+        self._rank = rank
+
+    @staticmethod
+    def _members(node):
+        if node.members is None:
+            node.members = frozenset(node.ids)
+        return node.members
+
+    def _node(self, token):
+        node = self._root
+        for ch in token:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def _fuzzy(self, token, max_dist):
+        # Levenshtein walk over the trie, anchored on the token's first character
+        # (first two for long tokens, where the walk would otherwise fan out); a
+        # node matches once the token is within max_dist of the prefix it spells.
+        # Cells further than max_dist from the diagonal can't match, so rows are banded.
+        anchor = 1 if len(token) <= 5 else 2
+        start = self._node(token[:anchor])
+        if start is None:
+            return {}
+        n, cap = len(token), max_dist + 1
+        first = tuple(min(abs(i - anchor), cap) for i in range(n + 1))
+        # Sibling subtrees keep reaching the same (row, char) pairs, so steps are memoised
+        steps = {}
+        matched = []
+        stack = [(child, ch, anchor + 1, first) for ch, child in start.children.items()]
+        while stack:
+            node, ch, depth, prev = stack.pop()
+            step = steps.get((prev, ch))
+            if step is None:
+                lo, hi = max(depth - max_dist, 1), min(depth + max_dist, n)
+                row = [cap] * (n + 1)
+                row[0] = min(depth, cap)
+                for i in range(lo, hi + 1):
+                    row[i] = min(row[i - 1] + 1, prev[i] + 1, prev[i - 1] + (token[i - 1] != ch), cap)
+                step = steps[prev, ch] = (tuple(row), min(row[lo - 1:hi + 1]) <= max_dist)
+            row, alive = step
+            if row[n] <= max_dist:
+                matched.append((row[n], node))
+            elif alive:
+                stack.extend((c, k, depth + 1, row) for k, c in node.children.items())
+
+        found = {}
+        # Closest matches go in last so their distance wins
+        for dist, node in sorted(matched, key=lambda m: -m[0]):
+            found.update(dict.fromkeys(node.ids, dist))
+        return found
+
+    @staticmethod
+    def _starting_with(keys, order, q):
+        return order[bisect.bisect_left(keys, q):bisect.bisect_left(keys, q + "\U0010ffff")]
+
+    def _in_tiers(self, ids, q, want, member):
+        """Up to `want` of `ids` (each passing `member`): ticker prefix matches,
+        then name prefix matches, then the rest, each in rank order."""
+        rank = self._rank.__getitem__
+        out = sorted(filter(member, self._starting_with(self._ticker_keys, self._by_ticker, q)), key=rank)
+        seen = set(out)
+        out += sorted((i for i in self._starting_with(self._name_keys, self._by_name, q)
+                       if i not in seen and member(i)), key=rank)
+        if len(out) < want:
+            seen.update(out)
+            rest = heapq.nsmallest(want - len(out) + len(seen), ids, key=rank)
+            out += [i for i in rest if i not in seen]
+        return out[:want]
+
+    def search(self, query, limit=20, offset=0):
+        """Return (total, entries) ordered by typo distance, match tier, then static rank."""
+        tokens = _tokenize(query)
+        if not tokens:
+            return 0, []
+        if self._rank is None:
+            self.rank_entries()
+        q = query.strip().lower()
+
+        if tokens == [q]:
+            node = self._node(q)
+            if node is not None:
+                if node.ranked is None:
+                    node.ranked = self._in_tiers(node.ids, q, len(node.ids), self._members(node).__contains__)
+                offset = min(offset, len(node.ranked))
+                return len(node.ranked), [self.entries[idx] for idx in node.ranked[offset:offset + limit]]
+
+        # Prefix hits are a trie node (no typo penalty); fuzzy hits map id -> distance
+        matches = []
+        for token in tokens:
+            node = self._node(token)
+            if node is not None:
+                matches.append((len(node.ids), node))
+                continue
+            hits = self._fuzzy(token, 1 if len(token) <= 5 else 2) if len(token) >= 3 else None
+            if not hits:
+                return 0, []
+            matches.append((len(hits), hits))
+
+        # Intersect from the rarest token so the work follows the smallest hit set
+        matches.sort(key=lambda m: m[0])
+        penalty = None
+        for _, hits in matches:
+            if isinstance(hits, _TrieNode):
+                if penalty is None:
+                    penalty = dict.fromkeys(hits.ids, 0)
+                else:
+                    members = self._members(hits)
+                    penalty = {idx: d for idx, d in penalty.items() if idx in members}
+            elif penalty is None:
+                penalty = hits
+            else:
+                penalty = {idx: d + hits[idx] for idx, d in penalty.items() if idx in hits}
+            if not penalty:
+                return 0, []
+
+        total = len(penalty)
+        offset = min(offset, total)
+        want = offset + limit
+        top = []
+        for dist in sorted(set(penalty.values())):
+            group = [idx for idx, d in penalty.items() if d == dist]
+            top += self._in_tiers(group, q, want - len(top), lambda idx: penalty.get(idx) == dist)
+            if len(top) >= want:
+                break
+        return total, [self.entries[idx] for idx in top[offset:want]]
+
+
+_stock_index = None
+_stock_index_lock = threading.Lock()
+
+
+def stock_index():
+    global _stock_index
+    if _stock_index is None:
+        with _stock_index_lock:
+            if _stock_index is None:
+                index = StockIndex()
+                for category, stocks in STOCK_LIST.items():
+                    for stock in stocks:
+                        index.add(stock["ticker"], stock["name"], category)
+                if os.path.exists(LISTINGS_FILE):
+                    try:
+                        index.load_csv(LISTINGS_FILE)
+                    except Exception as e:
+                        print(f"Listings Error: {e}")
+                index.rank_entries()
+                _stock_index = index
+    return _stock_index
+
+# ==============================================================================
+# BAR SERIES
+# ==============================================================================
+
+# float32 halves memory per cached series at ~7 significant digits of precision
+BAR_DTYPE = os.environ.get("MR_PREDICTOR_BAR_DTYPE", "float64")
+
+
+class BarSeries:
+    """Struct-of-arrays OHLC(V) bars; `time` holds int64 epoch seconds (UTC)."""
+
+    __slots__ = ("time", "open", "high", "low", "close", "volume")
+
+    def __init__(self, time, open, high, low, close, volume=None):
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def empty(cls, dtype=BAR_DTYPE):
+        return cls(np.empty(0, dtype=np.int64), *(np.empty(0, dtype=dtype) for _ in range(4)))
+
+    @classmethod
+    def from_frame(cls, df, dtype=BAR_DTYPE):
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        cols = {str(c).lower(): c for c in df.columns}
+
+        # .values on a tz-aware index is already UTC
+        times = df.index.values.astype("datetime64[s]").astype(np.int64)
+        ohlc = [np.ascontiguousarray(df[cols[k]].to_numpy(), dtype=dtype)
+                for k in ("open", "high", "low", "close")]
+        volume = None
+        if "volume" in cols:
+            volume = np.ascontiguousarray(df[cols["volume"]].to_numpy(), dtype=np.float64)
+        return cls(times, *ohlc, volume=volume)
+
+    def __len__(self):
+        return len(self.time)
+
+    def __getitem__(self, key):
+        # Slices are views, so tail()/windows never copy the underlying arrays
+        if not isinstance(key, slice):
+            raise TypeError("BarSeries only supports slicing")
+        return BarSeries(self.time[key], self.open[key], self.high[key], self.low[key],
+                         self.close[key], None if self.volume is None else self.volume[key])
+
+    def tail(self, n):
+        return self[-n:] if n < len(self) else self
+
+    def dropna(self):
+        valid = np.isfinite(self.open) & np.isfinite(self.high) & np.isfinite(self.low) & np.isfinite(self.close)
+        if valid.all():
+            return self
+        return BarSeries(self.time[valid], self.open[valid], self.high[valid], self.low[valid],
+                         self.close[valid], None if self.volume is None else self.volume[valid])
+
+    @property
+    def nbytes(self):
+        arrays = (self.time, self.open, self.high, self.low, self.close, self.volume)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def to_records(self):
+        keys = ("time", "open", "high", "low", "close")
+        cols = (self.time.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist())
+        return [dict(zip(keys, row)) for row in zip(*cols)]
+
+    def to_columns(self):
+        # Little-endian float64 buffers, decoded client-side as Float64Array
+        return {k: np.ascontiguousarray(getattr(self, k), dtype="<f8").tobytes()
+                for k in ("time", "open", "high", "low", "close")}
+
+    def to_arrow(self):
+        return pa.table({
+            "time": pa.array(self.time, type=pa.int64()),
+            "open": pa.array(self.open),
+            "high": pa.array(self.high),
+            "low": pa.array(self.low),
+            "close": pa.array(self.close)
+        })
+
 # ==============================================================================
 # MARKET ENGINE
 # ==============================================================================
 
+# Seconds a downloaded history stays fresh, per interval
+HISTORY_TTL = {"1m": 15, "1h": 60, "1d": 600}
+HISTORY_CACHE_SIZE = 256
+# Long export/tuning histories get their own cache, bounded by bytes rather than count,
+# so a bulk export can't evict the series open dashboards are polling
+EXPORT_CACHE_BYTES = int(os.environ.get("MR_PREDICTOR_EXPORT_CACHE_MB", "64")) * 1024 * 1024
+
+# "yahoo" downloads through yfinance; "synthetic" generates bars offline (load tests)
+DATA_SOURCE = os.environ.get("MR_PREDICTOR_DATA_SOURCE", "yahoo")
+SYNTHETIC_LATENCY = float(os.environ.get("MR_PREDICTOR_SYNTHETIC_LATENCY_MS", "0")) / 1000
+SYNTHETIC_MAX_BARS = 100_000
+
+INTERVAL_SECONDS = {"1m": 60, "1h": 3600, "1d": 86400}
+PERIOD_DAYS = {"1d": 1, "5d": 5, "1mo": 30, "3mo": 91, "6mo": 182, "1y": 365,
+               "2y": 730, "5y": 1826, "10y": 3652, "max": 7300}
+
+
+def synthetic_frame(ticker, period, interval):
+    """Random-walk bars shaped like a yf.download() frame, ending at the current bar."""
+    if SYNTHETIC_LATENCY:
+        time.sleep(SYNTHETIC_LATENCY)
+
+    step = INTERVAL_SECONDS.get(interval, 86400)
+    n = max(1, min(PERIOD_DAYS.get(period, 365) * 86400 // step, SYNTHETIC_MAX_BARS))
+    end = int(time.time()) // step * step
+    seed = zlib.crc32(ticker.encode())
+    rng = np.random.default_rng([seed, step, end // step])
+
+    close = (20 + seed % 480) * np.exp(np.cumsum(rng.normal(0, 0.001 * (step / 60) ** 0.5, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0, 0.0005, n)) * close
+    index = pd.to_datetime(end - step * np.arange(n - 1, -1, -1), unit="s", utc=True)
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread,
+        "Low": np.minimum(open_, close) - spread,
+        "Close": close,
+        "Volume": rng.integers(1_000, 1_000_000, n)
+    }, index=index)
+
+
+# Shared upstream HTTP session: bounded concurrency, keep-alive, timeouts and retries
+UPSTREAM_POOL_SIZE = int(os.environ.get("MR_PREDICTOR_UPSTREAM_POOL", "10"))
+UPSTREAM_TIMEOUT = float(os.environ.get("MR_PREDICTOR_UPSTREAM_TIMEOUT", "10"))
+UPSTREAM_RETRIES = int(os.environ.get("MR_PREDICTOR_UPSTREAM_RETRIES", "2"))
+UPSTREAM_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                       "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+
+class UpstreamSession:
+    """One keep-alive session shared by every upstream call, capped at `size` calls in flight.
+
+    curl_cffi (what yfinance prefers) keeps a curl handle per thread inside one
+    Session; plain requests gets a blocking pool of `size` connections. Transient
+    failures are retried at the transport level in both cases.
+    """
+
+    def __init__(self, size=UPSTREAM_POOL_SIZE, timeout=UPSTREAM_TIMEOUT, retries=UPSTREAM_RETRIES):
+        self.size = size
+        self.timeout = timeout
+        self.retries = retries
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._stats_lock = threading.Lock()
+        self._stats = {"calls": 0, "in_use": 0, "peak_in_use": 0, "waits": 0,
+                       "wait_seconds": 0.0, "timeouts": 0}
+
+    @property
+    def session(self):
+        return self.open()
+
+    def open(self):
+        """Build the shared session now rather than on the first upstream call."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self):
+        try:
+            from curl_cffi import requests as curl_requests
+        except ImportError:
+            curl_requests = None
+
+        if curl_requests is not None:
+            try:
+                retry = curl_requests.RetryStrategy(count=self.retries, delay=0.2, backoff="exponential")
+                return curl_requests.Session(impersonate="chrome", timeout=self.timeout, retry=retry)
+            except (AttributeError, TypeError):
+                # curl_cffi releases before RetryStrategy
+                return curl_requests.Session(impersonate="chrome", timeout=self.timeout)
+
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        session.headers["User-Agent"] = UPSTREAM_USER_AGENT
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.size,
+            pool_block=True,
+            max_retries=Retry(total=self.retries, backoff_factor=0.2,
+                              status_forcelist=(429, 500, 502, 503, 504))
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @contextmanager
+    def slot(self):
+        if not self._slots.acquire(blocking=False):
+            start = time.perf_counter()
+            acquired = self._slots.acquire(timeout=self.timeout)
+            with self._stats_lock:
+                self._stats["waits"] += 1
+                self._stats["wait_seconds"] += time.perf_counter() - start
+                if not acquired:
+                    self._stats["timeouts"] += 1
+            if not acquired:
+                raise TimeoutError("upstream pool exhausted")
+        with self._stats_lock:
+            self._stats["calls"] += 1
+            self._stats["in_use"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._stats["in_use"])
+        try:
+            yield
+        finally:
+            with self._stats_lock:
+                self._stats["in_use"] -= 1
+            self._slots.release()
+
+    def download(self, ticker, period, interval):
+        with self.slot():
+            if DATA_SOURCE == "synthetic":
+                return synthetic_frame(ticker, period, interval)
+            return yf.download(ticker, period=period, interval=interval, progress=False, threads=False,
+                               timeout=self.timeout, session=self.session)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["size"] = self.size
+        stats["utilization"] = stats["in_use"] / self.size
+        return stats
+
+
+# predict() parameters; tune_predictor.py writes per ticker/interval overrides to PARAMS_FILE
+DEFAULT_PREDICT_PARAMS = {"window": 15, "momentum": 1.5, "vol_cap": 0.9, "band": 0.2}
+PARAMS_FILE = os.environ.get(
+    "MR_PREDICTOR_PARAMS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "predictor_params.json")
+)
+
+
+def load_predict_params(path=PARAMS_FILE):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            tuned = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Params Error: {e}")
+        return {}
+    # Overrides that did not beat the defaults out of sample are ignored
+    return {
+        (ticker, interval): {k: type(v)(found[k]) for k, v in DEFAULT_PREDICT_PARAMS.items() if k in found}
+        for ticker, by_interval in tuned.items()
+        for interval, found in by_interval.items()
+        if found.get("oos_error", 0) < found.get("default_oos_error", float("inf"))
+    }
+
+
+def history_ttl(series, interval, now=None):
+    """Cache lifetime for a fresh series: HISTORY_TTL, but never past the next bar
+    close plus BAR_SETTLE, which is when next_refresh_ms sends clients back for it."""
+    now = time.time() if now is None else now
+    ttl = HISTORY_TTL.get(interval, 60)
+    if not len(series):
+        return ttl
+    step = INTERVAL_SECONDS.get(interval, 86400)
+    return min(ttl, step - (now - int(series.time[-1]) - BAR_SETTLE) % step)
+
+
+class HistoryCache:
+    """LRU of BarSeries with per-entry expiry, bounded by entry count and/or total bytes."""
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None and hit[0] < time.monotonic():
+                del self._entries[key]
+                self.nbytes -= hit[1].nbytes
+                hit = None
+            if hit is not None:
+                self._entries.move_to_end(key)
+        return None if hit is None else hit[1]
+
+    def put(self, key, series, ttl):
+        if self.max_bytes is not None and series.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1].nbytes
+            self._entries[key] = (time.monotonic() + ttl, series)
+            self.nbytes += series.nbytes
+            while ((self.max_entries is not None and len(self._entries) > self.max_entries)
+                   or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+
 class MarketEngine:
-    def get_history(self, ticker, interval):
+    def __init__(self):
+        self.params = load_predict_params()
+        self.upstream = UpstreamSession()
+        self._cache = HistoryCache(max_entries=HISTORY_CACHE_SIZE)
+        self._export_cache = HistoryCache(max_bytes=EXPORT_CACHE_BYTES)
+        self._stats = {"upstream_calls": 0, "upstream_errors": 0, "cache_hits": 0, "cache_misses": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["cached_series"] = len(self._cache)
+        stats["cache_bytes"] = self._cache.nbytes
+        stats["export_cached_series"] = len(self._export_cache)
+        stats["export_cache_bytes"] = self._export_cache.nbytes
+        stats["data_source"] = DATA_SOURCE
+        stats["upstream_pool"] = self.upstream.stats()
+        return stats
+
+    def _download(self, ticker, period, interval):
+        self._count("upstream_calls")
+        return self.upstream.download(ticker, period, interval)
+
+    def fetch_history(self, ticker, interval, period=None):
+        """Bars for ticker/interval; raises on upstream errors, empty if there are none."""
         period_map = {"1m": "1d", "1h": "1mo", "1d": "1y"}
-        p = period_map.get(interval, "1y")
+        p = period or period_map.get(interval, "1y")
+
+        # An explicit period is an export/tuning history; keep it out of the dashboard cache
+        cache = self._cache if period is None else self._export_cache
+        key = (ticker, interval, p)
+        series = cache.get(key)
+        self._count("cache_misses" if series is None else "cache_hits")
+        if series is not None:
+            return series
         
         try:
-            df = yf.download(ticker, period=p, interval=interval, progress=False)
-            if df.empty: return []
+            df = self._download(ticker, p, interval)
+            if df.empty: return BarSeries.empty()
             
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            
-            df = df.reset_index()
-            df.columns = [c.lower() for c in df.columns]
-            date_col = 'date' if 'date' in df.columns else 'datetime'
-            
-            data = []
-            for _, row in df.iterrows():
-                data.append({
-                    "time": str(row[date_col]),
-                    "open": float(row['open']),
-                    "high": float(row['high']),
-                    "low": float(row['low']),
-                    "close": float(row['close'])
-                })
-            return data
+            series = BarSeries.from_frame(df)
+        except Exception:
+            self._count("upstream_errors")
+            raise
+
+        cache.put(key, series, history_ttl(series, interval))
+        return series
+
+    def get_history(self, ticker, interval, period=None):
+        try:
+            return self.fetch_history(ticker, interval, period)
         except Exception as e:
             print(f"History Error: {e}")
-            return []
+            return BarSeries.empty()
 
     def get_live_price(self, ticker):
         try:
-            df = yf.download(ticker, period="1d", interval="1m", progress=False)
+            df = self._download(ticker, "1d", "1m")
             if df.empty: return None
             
             if isinstance(df.columns, pd.MultiIndex):
@@ -127,35 +762,309 @@ class MarketEngine:
                 
             return float(df['Close'].iloc[-1])
         except:
+            self._count("upstream_errors")
             return None
 
-    def predict(self, history, current_price):
-        if len(history) < 15 or current_price is None: return None
+    def predict_params(self, ticker, interval):
+        return dict(DEFAULT_PREDICT_PARAMS, **self.params.get((ticker, interval), {}))
+
+    def predict(self, history, current_price, params=None):
+        params = params or DEFAULT_PREDICT_PARAMS
+        window_size = params["window"]
+        if len(history) < window_size or current_price is None: return None
         
-        window = history[-15:]
+        window = history.tail(window_size)
         weights = np.linspace(0.1, 1.0, len(window))
-        changes = np.array([d['close'] - d['open'] for d in window])
-        momentum = np.sum(changes * weights) / np.sum(weights)
-        volatility = np.mean([d['high'] - d['low'] for d in window])
+        changes = window.close - window.open
+        momentum = float(np.dot(changes, weights) / np.sum(weights))
+        volatility = float(np.mean(window.high - window.low))
         
         start_point = current_price 
-        move = momentum * 1.5
-        max_move = volatility * 0.9
+        move = momentum * params["momentum"]
+        max_move = volatility * params["vol_cap"]
         
         if abs(move) > max_move:
-            move = np.sign(move) * max_move
+            move = float(np.sign(move)) * max_move
             
         pred_close = start_point + move
+        band = volatility * params["band"]
         
         return {
             "open": start_point,
             "close": pred_close,
-            "high": max(start_point, pred_close) + (volatility * 0.2),
-            "low": min(start_point, pred_close) - (volatility * 0.2),
+            "high": max(start_point, pred_close) + band,
+            "low": min(start_point, pred_close) - band,
             "is_prediction": True
         }
 
-engine = MarketEngine()
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = MarketEngine()
+    return _engine
+
+
+# Comma-separated tickers whose 1h history warm_up() prefetches
+WARMUP_TICKERS = os.environ.get("MR_PREDICTOR_WARMUP_TICKERS", "")
+
+
+def warm_up(tickers=None):
+    """Load heavy dependencies and shared state before a worker takes traffic.
+
+    Call from the process manager's worker hook (e.g. gunicorn's
+    ``post_worker_init``); returns the seconds spent.
+    """
+    start = time.perf_counter()
+    for module in (np, pd, yf, msgpack, pa):
+        if module is not None:
+            module._load()
+    engine = get_engine()
+    if DATA_SOURCE != "synthetic":
+        engine.upstream.open()
+    stock_index()
+
+    if tickers is None:
+        tickers = [t.strip() for t in WARMUP_TICKERS.split(",") if t.strip()]
+    for ticker in tickers:
+        engine.get_history(ticker, "1h")
+    return time.perf_counter() - start
+
+# ==============================================================================
+# REFRESH CADENCE
+# ==============================================================================
+
+# Seconds between polls while a market trades; the live price moves within a bar
+LIVE_REFRESH = {"1m": 5, "1h": 30, "1d": 300}
+MIN_REFRESH = 5
+MAX_REFRESH = 3600
+ERROR_REFRESH = 30
+# Give the upstream a moment to publish a bar that just closed
+BAR_SETTLE = 2
+# A last bar this many intervals old means the feed is not updating (halt, holiday)
+STALE_BARS = 3
+
+CRYPTO_RE = re.compile(r"-(USD|USDT|USDC|EUR|GBP|BTC|ETH)$")
+MARKET_OPEN = dtime(9, 30)
+MARKET_CLOSE = dtime(16, 0)
+try:
+    MARKET_TZ = ZoneInfo("America/New_York")
+except ZoneInfoNotFoundError:
+    # Without tz data treat stocks as always open: more polling, never stale
+    MARKET_TZ = None
+
+
+def trades_around_the_clock(ticker):
+    # Synthetic bars run continuously, so load tests get trading-hours cadence at any hour
+    return DATA_SOURCE == "synthetic" or bool(CRYPTO_RE.search(ticker.upper()))
+
+
+def seconds_until_open(now):
+    """0 while US equities trade, else seconds until the next weekday 09:30 New York open."""
+    if MARKET_TZ is None:
+        return 0
+    local = now.astimezone(MARKET_TZ)
+    if local.weekday() < 5 and MARKET_OPEN <= local.time() < MARKET_CLOSE:
+        return 0
+
+    day = local.date()
+    if local.time() >= MARKET_OPEN:
+        day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return (datetime.combine(day, MARKET_OPEN, tzinfo=MARKET_TZ) - local).total_seconds()
+
+
+def last_session_open(now):
+    """Epoch seconds of the most recent weekday 09:30 New York open at or before `now`."""
+    if MARKET_TZ is None:
+        return None
+    local = now.astimezone(MARKET_TZ)
+    day = local.date()
+    if local.time() < MARKET_OPEN:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return datetime.combine(day, MARKET_OPEN, tzinfo=MARKET_TZ).timestamp()
+
+
+def next_refresh_ms(ticker, interval, history, live_price, now=None):
+    """Milliseconds the client should wait before polling this ticker/interval again."""
+    now = time.time() if now is None else now
+    if not len(history) or live_price is None:
+        return ERROR_REFRESH * 1000
+
+    step = INTERVAL_SECONDS.get(interval, 86400)
+    cadence = LIVE_REFRESH.get(interval, 60)
+
+    last_bar = int(history.time[-1])
+    # Stocks only count the feed as stale once the session has run long enough to
+    # produce new bars; overnight and weekend gaps are not staleness
+    fresh_since = last_bar
+    if not trades_around_the_clock(ticker):
+        now_utc = datetime.fromtimestamp(now, timezone.utc)
+        closed_for = seconds_until_open(now_utc)
+        if closed_for > 0:
+            return int(min(closed_for + BAR_SETTLE, MAX_REFRESH) * 1000)
+        session_open = last_session_open(now_utc)
+        if session_open is not None:
+            fresh_since = max(last_bar, session_open)
+
+    age = now - last_bar
+    if now - fresh_since > STALE_BARS * step:
+        wait = max(cadence * 6, 60)
+    else:
+        wait = min(cadence, step - age % step + BAR_SETTLE)
+    return int(min(max(wait, MIN_REFRESH), MAX_REFRESH) * 1000)
+
+# ==============================================================================
+# PROFILING
+# ==============================================================================
+
+# Profiling is off unless an admin token or a sample rate is configured
+PROFILE_DIR = os.environ.get(
+    "MR_PREDICTOR_PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+)
+PROFILE_SAMPLE_RATE = float(os.environ.get("MR_PREDICTOR_PROFILE_RATE", "0"))
+PROFILE_INTERVAL = float(os.environ.get("MR_PREDICTOR_PROFILE_INTERVAL", "0.001"))
+# Oldest profiles beyond this many are deleted as new ones are written
+PROFILE_KEEP = int(os.environ.get("MR_PREDICTOR_PROFILE_KEEP", "100"))
+ADMIN_TOKEN = os.environ.get("MR_PREDICTOR_ADMIN_TOKEN", "")
+
+
+class RequestProfiler:
+    """Statistical profiler that samples one thread's stack from a helper thread."""
+
+    def __init__(self, thread_id, interval=PROFILE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames = []
+        self.samples = []
+        self.weights = []
+        self._frame_ids = {}
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._done.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def _frame_id(self, code):
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        fid = self._frame_ids.get(key)
+        if fid is None:
+            fid = self._frame_ids[key] = len(self.frames)
+            self.frames.append({"name": key[0], "file": key[1], "line": key[2]})
+        return fid
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            if not codes or _PROFILER_STOP_CODE in codes:
+                continue
+            self.samples.append([self._frame_id(code) for code in reversed(codes)])
+            self.weights.append(now - last)
+            last = now
+
+    def to_speedscope(self, name):
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "mr-predictor",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.elapsed,
+                "samples": self.samples,
+                "weights": self.weights
+            }]
+        }
+
+
+# Samples taken while the request thread sits in stop() are not request time
+_PROFILER_STOP_CODE = RequestProfiler.stop.__code__
+
+
+def _admin_profile_requested():
+    if not ADMIN_TOKEN:
+        return False
+    if request.args.get('profile') != '1' and request.headers.get('X-Profile') != '1':
+        return False
+    # Compare bytes: compare_digest rejects non-ASCII str, and header values arrive as latin-1
+    token = request.headers.get('X-Admin-Token', '')
+    return hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+
+def _prune_profiles():
+    # Filenames start with a millisecond timestamp, so name order is age order
+    names = sorted(n for n in os.listdir(PROFILE_DIR) if n.endswith(".speedscope.json"))
+    for name in names[:max(0, len(names) - PROFILE_KEEP)]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, name))
+        except OSError:
+            pass
+
+
+def profiled(view):
+    """Profile a view when asked and write a speedscope file to PROFILE_DIR.
+
+    A request is profiled when an admin (X-Admin-Token) sends ``?profile=1`` or
+    ``X-Profile: 1``, or when it falls in MR_PREDICTOR_PROFILE_RATE of traffic.
+    Only admin requests get the output path back in X-Profile-File. With
+    neither configured the view is returned undecorated.
+    """
+    if PROFILE_SAMPLE_RATE <= 0 and not ADMIN_TOKEN:
+        return view
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        admin = _admin_profile_requested()
+        if not admin and not (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE):
+            return view(*args, **kwargs)
+
+        profiler = RequestProfiler(threading.get_ident())
+        profiler.start()
+        try:
+            response = make_response(view(*args, **kwargs))
+        finally:
+            profiler.stop()
+
+        label = "-".join([request.endpoint or "request"] + list(request.args.values()))
+        filename = "{}-{}.speedscope.json".format(
+            int(time.time() * 1000), re.sub(r"[^A-Za-z0-9_.-]+", "_", label)[:80])
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, filename)
+            with open(path, "w") as f:
+                json.dump(profiler.to_speedscope(f"{request.method} {request.full_path}"), f)
+            _prune_profiles()
+            if admin:
+                response.headers['X-Profile-File'] = path
+        except OSError as e:
+            print(f"Profile Error: {e}")
+        return response
+
+    return wrapper
 
 # ==============================================================================
 # ROUTES
@@ -166,24 +1075,210 @@ def index():
     return render_template_string(HTML_TEMPLATE)
 
 @app.route('/api/stocks')
+@profiled
 def get_stocks():
-    return jsonify(STOCK_LIST)
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify(STOCK_LIST)
+
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 200)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    total, results = stock_index().search(q, limit, offset)
+    offset = min(offset, total)
+
+    return jsonify({
+        'query': q,
+        'total': total,
+        'offset': offset,
+        'limit': limit,
+        'results': results
+    })
+
+@app.route('/api/stats')
+def get_stats():
+    return jsonify(get_engine().stats())
+
+# ==============================================================================
+# WIRE FORMATS
+# ==============================================================================
+
+JSON_MIME = "application/json"
+MSGPACK_MIME = "application/msgpack"
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+
+FORMAT_ALIASES = {"json": JSON_MIME, "msgpack": MSGPACK_MIME, "arrow": ARROW_MIME}
+
+
+def available_formats():
+    formats = [JSON_MIME]
+    if msgpack is not None:
+        formats.append(MSGPACK_MIME)
+    if pa is not None:
+        formats.append(ARROW_MIME)
+    return formats
+
+
+def negotiate_format():
+    formats = available_formats()
+    explicit = FORMAT_ALIASES.get(request.args.get('format', '').lower())
+    if explicit in formats:
+        return explicit
+    return request.accept_mimetypes.best_match(formats, default=JSON_MIME)
+
+
+def render_bars(payload, bars, key='history'):
+    """Respond with `payload` plus `bars` under `key` in the negotiated format.
+
+    JSON carries the bars as records; MessagePack carries them as raw float64
+    column buffers; Arrow IPC sends them as a record batch with the remaining
+    payload fields JSON-encoded in the schema metadata.
+    """
+    mime = negotiate_format()
+
+    if mime == MSGPACK_MIME:
+        body = msgpack.packb(dict(payload, **{key: bars.to_columns()}), use_bin_type=True)
+    elif mime == ARROW_MIME:
+        table = bars.to_arrow().replace_schema_metadata({"payload": json.dumps(payload)})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        body = sink.getvalue().to_pybytes()
+    else:
+        response = jsonify(dict(payload, **{key: bars.to_records()}))
+        response.vary.add('Accept')
+        return response
+
+    response = Response(body, mimetype=mime)
+    response.vary.add('Accept')
+    return response
+
 
 @app.route('/api/data')
+@profiled
 def get_data():
     ticker = request.args.get('ticker', 'BTC-USD')
     interval = request.args.get('interval', '1h')
     
+    engine = get_engine()
     history = engine.get_history(ticker, interval)
     live_price = engine.get_live_price(ticker)
-    prediction = engine.predict(history, live_price)
+    prediction = engine.predict(history, live_price, engine.predict_params(ticker, interval))
     
-    return jsonify({
-        'history': history[-50:],
+    return render_bars({
         'live_price': live_price,
         'prediction': prediction,
+        'next_refresh_ms': next_refresh_ms(ticker, interval, history, live_price),
         'timestamp': datetime.now().isoformat()
-    })
+    }, history.tail(50))
+
+# ==============================================================================
+# BULK EXPORT
+# ==============================================================================
+
+# Longest lookback Yahoo serves per interval (intraday history is capped)
+EXPORT_PERIOD = {"1m": "5d", "1h": "1y", "1d": "max"}
+EXPORT_CHUNK_ROWS = 5000
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+# Series that could not be exported get a row with only ticker, interval and error set
+CSV_HEADER = "ticker,interval,time,open,high,low,close,volume,error\n"
+# Tickers are written into CSV/NDJSON rows verbatim, so only plain symbols are accepted
+TICKER_RE = re.compile(r"^[A-Z0-9.^=-]{1,15}$")
+
+
+def _export_chunks(series, ticker, interval, fmt):
+    """Yield the series as text chunks of at most EXPORT_CHUNK_ROWS rows."""
+    series = series.dropna()
+    if fmt == "ndjson":
+        prefix = '{{{{"ticker":"{}","interval":"{}",'.format(ticker, interval)
+        row = prefix + '"time":{},"open":{!r},"high":{!r},"low":{!r},"close":{!r},"volume":{}}}\n'
+        missing = "null"
+    else:
+        prefix = "{},{},".format(ticker, interval)
+        row = prefix + "{},{!r},{!r},{!r},{!r},{},\n"
+        missing = ""
+
+    for start in range(0, len(series), EXPORT_CHUNK_ROWS):
+        chunk = series[start:start + EXPORT_CHUNK_ROWS]
+        volume = chunk.volume.tolist() if chunk.volume is not None else [None] * len(chunk)
+        yield "".join(
+            row.format(t, o, h, l, c, missing if v is None or v != v else int(v))
+            for t, o, h, l, c, v in zip(chunk.time.tolist(), chunk.open.tolist(), chunk.high.tolist(),
+                                        chunk.low.tolist(), chunk.close.tolist(), volume)
+        )
+
+
+def _export_error(ticker, interval, error, fmt):
+    if fmt == "ndjson":
+        return '{{"ticker":"{}","interval":"{}","error":"{}"}}\n'.format(ticker, interval, error)
+    return "{},{},,,,,,,{}\n".format(ticker, interval, error)
+
+
+def _fetch_for_export(engine, ticker, interval):
+    """Return (series, error); error is None, "no data" or "fetch failed"."""
+    try:
+        series = engine.fetch_history(ticker, interval, EXPORT_PERIOD[interval])
+    except Exception as e:
+        print(f"Export Error: {ticker} {interval}: {e}")
+        return None, "fetch failed"
+    return series, (None if len(series) else "no data")
+
+
+@app.route('/api/export')
+def export_history():
+    """Stream full history for tickers x intervals as CSV or NDJSON.
+
+    Series go through the engine's export cache (bounded by EXPORT_CACHE_BYTES
+    and separate from the dashboard cache), so repeat exports reuse them; only
+    one series is formatted at a time, so memory stays flat however many rows go out.
+
+    A series that fails or comes back empty gets an error row instead of
+    being left out; if none of them has bars the request fails with a 502
+    before anything is streamed.
+    """
+    tickers = [t.strip().upper() for t in request.args.get('tickers', '').split(',') if t.strip()]
+    intervals = [i.strip() for i in request.args.get('intervals', '1d').split(',') if i.strip()]
+    fmt = request.args.get('format')
+    if fmt is None:
+        best = request.accept_mimetypes.best_match(list(EXPORT_FORMATS.values()), default="text/csv")
+        fmt = next(k for k, v in EXPORT_FORMATS.items() if v == best)
+
+    if not tickers:
+        return jsonify({'error': 'tickers is required'}), 400
+    invalid = [t for t in tickers if not TICKER_RE.match(t)]
+    if invalid:
+        return jsonify({'error': f'invalid tickers: {invalid}'}), 400
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f'format must be one of {sorted(EXPORT_FORMATS)}'}), 400
+    unknown = [i for i in intervals if i not in EXPORT_PERIOD]
+    if unknown:
+        return jsonify({'error': f'unsupported intervals: {unknown}'}), 400
+
+    engine = get_engine()
+    fetches = ((ticker, interval, *_fetch_for_export(engine, ticker, interval))
+               for ticker in tickers for interval in intervals)
+
+    # Fetch up to the first series with bars before committing to a 200
+    fetched = []
+    for item in fetches:
+        fetched.append(item)
+        if item[3] is None:
+            break
+    else:
+        failed = [f"{ticker} {interval}: {error}" for ticker, interval, _, error in fetched]
+        return jsonify({'error': 'no history could be fetched', 'failed': failed}), 502
+
+    def generate():
+        if fmt == "csv":
+            yield CSV_HEADER
+        for ticker, interval, series, error in itertools.chain(fetched, fetches):
+            if error is None:
+                yield from _export_chunks(series, ticker, interval, fmt)
+            else:
+                yield _export_error(ticker, interval, error, fmt)
+
+    response = Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="export.{fmt}"'
+    return response
 
 # ==============================================================================
 # HTML TEMPLATE
@@ -197,6 +1292,7 @@ HTML_TEMPLATE = """
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Mr. Predictor • Live Trading Terminal</title>
     <script src="https://cdn.jsdelivr.net/npm/lightweight-charts@4.1.1/dist/lightweight-charts.standalone.production.js"></script>
+    <script src="https://cdn.jsdelivr.net/npm/@msgpack/msgpack@2.8.0/dist.es5+umd/msgpack.min.js"></script>
     <style>
         * {
             margin: 0;
@@ -617,7 +1713,7 @@ HTML_TEMPLATE = """
                 
                 <div class="control-group">
                     <label class="control-label">TIMEFRAME</label>
-                    <select id="timeframe">
+                    <select id="timeframe" onchange="if (isRunning) updateData()">
                         <option value="1m">1 Minute</option>
                         <option value="1h" selected>1 Hour</option>
                         <option value="1d">1 Day</option>
@@ -687,7 +1783,7 @@ HTML_TEMPLATE = """
 
     <script>
         let isRunning = false;
-        let updateInterval = null;
+        let updateTimer = null;
         let chart = null;
         let candlestickSeries = null;
         let stocksData = {};
@@ -746,7 +1842,21 @@ HTML_TEMPLATE = """
                 renderStocksList();
             });
 
-        function renderStocksList(filter = '') {
+        function createStockItem(stock) {
+            const item = document.createElement('div');
+            item.className = 'stock-item';
+            const ticker = document.createElement('span');
+            ticker.className = 'stock-ticker';
+            ticker.textContent = stock.ticker;
+            const name = document.createElement('span');
+            name.className = 'stock-name';
+            name.textContent = stock.name;
+            item.append(ticker, name);
+            item.onclick = () => selectStock(stock.ticker);
+            return item;
+        }
+
+        function renderStocksList() {
             const container = document.getElementById('stocksList');
             container.innerHTML = '';
             
@@ -759,26 +1869,67 @@ HTML_TEMPLATE = """
                 header.textContent = category;
                 categoryDiv.appendChild(header);
                 
-                stocks.forEach(stock => {
-                    const fullText = `${stock.ticker} ${stock.name}`.toLowerCase();
-                    if (filter === '' || fullText.includes(filter.toLowerCase())) {
-                        const item = document.createElement('div');
-                        item.className = 'stock-item';
-                        item.innerHTML = `<span class="stock-ticker">${stock.ticker}</span><span class="stock-name">${stock.name}</span>`;
-                        item.onclick = () => selectStock(stock.ticker);
-                        categoryDiv.appendChild(item);
-                    }
-                });
-                
-                if (categoryDiv.children.length > 1) {
-                    container.appendChild(categoryDiv);
-                }
+                stocks.forEach(stock => categoryDiv.appendChild(createStockItem(stock)));
+                container.appendChild(categoryDiv);
+            }
+        }
+
+        // Search runs server-side; only the current page of matches is rendered
+        const SEARCH_PAGE_SIZE = 50;
+        let searchTimer = null;
+        let searchSeq = 0;
+
+        function renderSearchResults(data, append) {
+            const container = document.getElementById('stocksList');
+            let categoryDiv = container.querySelector('.category');
+            
+            if (!append || !categoryDiv) {
+                container.innerHTML = '';
+                categoryDiv = document.createElement('div');
+                categoryDiv.className = 'category';
+                const header = document.createElement('div');
+                header.className = 'category-header';
+                categoryDiv.appendChild(header);
+                container.appendChild(categoryDiv);
+            }
+            
+            categoryDiv.querySelector('.category-header').textContent = `🔍 ${data.total} matches`;
+            const more = categoryDiv.querySelector('.load-more');
+            if (more) more.remove();
+            
+            data.results.forEach(stock => categoryDiv.appendChild(createStockItem(stock)));
+            
+            const shown = data.offset + data.results.length;
+            if (shown < data.total) {
+                const loadMore = document.createElement('div');
+                loadMore.className = 'stock-item load-more';
+                loadMore.textContent = `Show more (${data.total - shown} remaining)`;
+                loadMore.onclick = () => searchStocks(data.query, shown);
+                categoryDiv.appendChild(loadMore);
             }
         }
 
+        function searchStocks(query, offset = 0) {
+            const seq = ++searchSeq;
+            fetch(`/api/stocks?q=${encodeURIComponent(query)}&limit=${SEARCH_PAGE_SIZE}&offset=${offset}`)
+                .then(r => r.json())
+                .then(data => {
+                    if (seq === searchSeq) {
+                        renderSearchResults(data, offset > 0);
+                    }
+                })
+                .catch(err => console.error('Search Error:', err));
+        }
+
         function filterStocks() {
-            const filter = document.getElementById('searchInput').value;
-            renderStocksList(filter);
+            const filter = document.getElementById('searchInput').value.trim();
+            clearTimeout(searchTimer);
+            if (filter === '') {
+                searchSeq++;
+                renderStocksList();
+                return;
+            }
+            searchTimer = setTimeout(() => searchStocks(filter), 120);
         }
 
         function openStockSelector() {
@@ -810,26 +1961,80 @@ HTML_TEMPLATE = """
                 btnText.textContent = '⏹ STOP ENGINE';
                 dot.classList.add('active');
                 updateData();
-                updateInterval = setInterval(updateData, 5000);
             } else {
                 btn.classList.remove('running');
                 btnText.textContent = '⚡ START ENGINE';
                 dot.classList.remove('active');
-                clearInterval(updateInterval);
+                clearTimeout(updateTimer);
             }
         }
 
+        // The server says when new data is worth asking for; up to 20% jitter keeps tabs from
+        // syncing up, and only ever delays so a poll aimed just after a bar close can't land before it
+        const DEFAULT_REFRESH_MS = 5000;
+
+        function scheduleUpdate(ms) {
+            clearTimeout(updateTimer);
+            if (!isRunning) return;
+            const delay = Math.max(1000, ms || DEFAULT_REFRESH_MS) * (1 + Math.random() * 0.2);
+            updateTimer = setTimeout(updateData, delay);
+        }
+
+        // Ask for columnar MessagePack when the decoder loaded; JSON otherwise
+        const WIRE_FORMAT = typeof MessagePack !== 'undefined' ? 'application/msgpack' : 'application/json';
+
+        function float64Column(bytes) {
+            // Copy so the Float64Array starts on an aligned buffer
+            return new Float64Array(bytes.slice().buffer);
+        }
+
+        function decodeColumnar(data) {
+            const cols = data.history;
+            const time = float64Column(cols.time);
+            const open = float64Column(cols.open);
+            const high = float64Column(cols.high);
+            const low = float64Column(cols.low);
+            const close = float64Column(cols.close);
+            data.history = Array.from(time, (t, i) => ({
+                time: t,
+                open: open[i],
+                high: high[i],
+                low: low[i],
+                close: close[i]
+            }));
+            return data;
+        }
+
+        function fetchData(url) {
+            return fetch(url, { headers: { 'Accept': WIRE_FORMAT } }).then(r => {
+                const type = r.headers.get('Content-Type') || '';
+                if (type.startsWith('application/msgpack')) {
+                    return r.arrayBuffer().then(buf => decodeColumnar(MessagePack.decode(new Uint8Array(buf))));
+                }
+                return r.json();
+            });
+        }
+
+        let updateSeq = 0;
+
         function updateData() {
             const ticker = document.getElementById('selectedTicker').textContent;
             const interval = document.getElementById('timeframe').value;
+            const seq = ++updateSeq;
+            clearTimeout(updateTimer);
             
-            fetch(`/api/data?ticker=${ticker}&interval=${interval}`)
-                .then(r => r.json())
+            fetchData(`/api/data?ticker=${ticker}&interval=${interval}`)
                 .then(data => {
+                    // A ticker/timeframe switch started a newer request; let it reschedule
+                    if (seq !== updateSeq) return;
                     updateKPIs(data);
                     updateChart(data);
+                    scheduleUpdate(data.next_refresh_ms);
                 })
-                .catch(err => console.error('Error:', err));
+                .catch(err => {
+                    console.error('Error:', err);
+                    if (seq === updateSeq) scheduleUpdate(DEFAULT_REFRESH_MS);
+                });
         }
 
         function updateKPIs(data) {
@@ -866,7 +2071,7 @@ HTML_TEMPLATE = """
 
         function updateChart(data) {
             const candleData = data.history.map(d => ({
-                time: Math.floor(new Date(d.time).getTime() / 1000),
+                time: d.time,
                 open: d.open,
                 high: d.high,
                 low: d.low,
@@ -895,5 +2100,6 @@ HTML_TEMPLATE = """
 
 if __name__ == '__main__':
     print("🚀 Mr. Predictor starting...")
+    print(f"🔥 Warm-up finished in {warm_up():.2f}s")
     print("📊 Access the app at: http://localhost:5000")
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
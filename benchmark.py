@@ -0,0 +1,97 @@
+"""
+Mr. Predictor - Benchmarks
+================================================
+Measures worker startup (cold import + warm-up) and the hot paths behind
+/api/data and /api/stocks using synthetic bars, so no network is needed.
+Run: python benchmark.py [--runs 5]
+"""
+
+import argparse
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Mr Predictor.py")
+
+STARTUP_SNIPPET = """
+import importlib.util, sys, time
+t0 = time.perf_counter()
+spec = importlib.util.spec_from_file_location("mr_predictor", {path!r})
+app = importlib.util.module_from_spec(spec)
+sys.modules["mr_predictor"] = app
+spec.loader.exec_module(app)
+t1 = time.perf_counter()
+app.warm_up([])
+t2 = time.perf_counter()
+print(t1 - t0, t2 - t1)
+"""
+
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("mr_predictor", APP_PATH)
+    app = importlib.util.module_from_spec(spec)
+    sys.modules["mr_predictor"] = app
+    spec.loader.exec_module(app)
+    return app
+
+
+def synthetic_series(app, n, seed=0):
+    np = app.np
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(n).cumsum()
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.standard_normal(n))
+    times = 1_700_000_000 + 3600 * np.arange(n, dtype=np.int64)
+    return app.BarSeries(times, open_, np.maximum(open_, close) + spread,
+                         np.minimum(open_, close) - spread, close)
+
+
+def timeit(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def bench_startup(runs):
+    imports, warmups = [], []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", STARTUP_SNIPPET.format(path=APP_PATH)],
+                             capture_output=True, text=True, check=True).stdout.split()
+        imports.append(float(out[0]))
+        warmups.append(float(out[1]))
+    print(f"startup.import     {statistics.median(imports) * 1000:9.1f} ms  (median of {runs} cold processes)")
+    print(f"startup.warm_up    {statistics.median(warmups) * 1000:9.1f} ms")
+
+
+def bench_hot_paths(app, repeat):
+    engine = app.get_engine()
+    series = synthetic_series(app, 720)
+    index = app.stock_index()
+
+    rows = [
+        ("predict", lambda: engine.predict(series, float(series.close[-1]))),
+        ("history.to_records", lambda: series.tail(50).to_records()),
+        ("stocks.search", lambda: index.search("app", 20)),
+    ]
+    for name, fn in rows:
+        print(f"{name:<18} {timeit(fn, repeat) * 1e6:9.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mr. Predictor benchmarks")
+    parser.add_argument("--runs", type=int, default=5, help="cold-start processes to time")
+    parser.add_argument("--repeat", type=int, default=1000, help="iterations per hot-path timing")
+    args = parser.parse_args()
+
+    bench_startup(args.runs)
+    bench_hot_paths(load_app(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
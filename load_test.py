@@ -0,0 +1,215 @@
+"""
+Mr. Predictor - Dashboard Load Generator
+================================================
+Simulates N open dashboards against a running server: each polls /api/data
+on the front-end's cadence (the server's next_refresh_ms hint with jitter, or
+a fixed --poll period with --fixed-poll) and now and then switches ticker or
+timeframe, which fires an immediate extra request just like the page does.
+
+Start the server offline first:
+    MR_PREDICTOR_DATA_SOURCE=synthetic python "Mr Predictor.py"
+Then step through dashboard counts to find the saturation point:
+    python load_test.py --dashboards 10,50,100,200 --duration 60
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+INTERVALS = ["1m", "1h", "1d"]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float("nan")
+    k = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class Client:
+    """One keep-alive HTTP connection, like a single browser tab."""
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self._conn = conn_cls(parts.hostname, parts.port, timeout=timeout)
+        self._prefix = parts.path.rstrip("/")
+
+    def get(self, path):
+        try:
+            self._conn.request("GET", self._prefix + path)
+            response = self._conn.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self._conn.close()
+            raise
+
+    def get_json(self, path):
+        status, body = self.get(path)
+        if status != 200:
+            raise RuntimeError(f"GET {path} returned {status}")
+        return json.loads(body)
+
+    def close(self):
+        self._conn.close()
+
+
+class Dashboard(threading.Thread):
+    def __init__(self, args, tickers, stop_at, rng):
+        super().__init__(daemon=True)
+        self.args = args
+        self.tickers = tickers
+        self.stop_at = stop_at
+        self.rng = rng
+        self.latencies = []
+        self.errors = 0
+        # Seconds waited before each poll, to estimate the demand the server asked for
+        self.waits = []
+
+    def _request(self, client, ticker, interval):
+        """Fetch once; return the server's refresh hint in seconds, if any."""
+        start = time.perf_counter()
+        try:
+            status, body = client.get(f"/api/data?ticker={ticker}&interval={interval}")
+            ok = status == 200
+        except (OSError, http.client.HTTPException):
+            ok = False
+        if not ok:
+            self.errors += 1
+            return None
+        self.latencies.append(time.perf_counter() - start)
+        if self.args.fixed_poll:
+            return None
+        hint = json.loads(body).get("next_refresh_ms")
+        return hint / 1000 if hint else None
+
+    def run(self):
+        args, rng = self.args, self.rng
+        client = Client(args.url, args.timeout)
+        ticker = rng.choice(self.tickers)
+        interval = rng.choice(INTERVALS)
+
+        # Tabs are opened at different moments, not in lockstep
+        next_poll = time.monotonic() + rng.uniform(0, args.poll)
+        while True:
+            now = time.monotonic()
+            if next_poll > now:
+                time.sleep(max(0.0, min(next_poll, self.stop_at) - now))
+            if time.monotonic() >= self.stop_at:
+                break
+
+            if rng.random() < args.switch_prob:
+                if rng.random() < 0.5:
+                    ticker = rng.choice(self.tickers)
+                else:
+                    interval = rng.choice(INTERVALS)
+                self._request(client, ticker, interval)
+            hint = self._request(client, ticker, interval)
+
+            if hint is None:
+                self.waits.append(args.poll)
+                next_poll += args.poll
+            else:
+                # Same 0-20% delay jitter as the page's scheduleUpdate()
+                wait = max(1.0, hint) * rng.uniform(1.0, 1.2)
+                self.waits.append(wait)
+                next_poll = time.monotonic() + wait
+        client.close()
+
+
+def run_step(args, tickers, dashboards, seed):
+    control = Client(args.url, args.timeout)
+    before = control.get_json("/api/stats")
+
+    start = time.monotonic()
+    stop_at = start + args.duration
+    threads = [Dashboard(args, tickers, stop_at, random.Random(seed + i)) for i in range(dashboards)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+
+    after = control.get_json("/api/stats")
+    control.close()
+
+    latencies = sorted(l for t in threads for l in t.latencies)
+    errors = sum(t.errors for t in threads)
+    total = len(latencies) + errors
+    return {
+        "dashboards": dashboards,
+        "requests": total,
+        "throughput": total / elapsed,
+        "expected": expected_rate(threads, args),
+        "p50": percentile(latencies, 50) * 1000,
+        "p95": percentile(latencies, 95) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+        "error_rate": errors / total if total else 0.0,
+        "upstream_calls": after["upstream_calls"] - before["upstream_calls"],
+        "data_source": after.get("data_source")
+    }
+
+
+def expected_rate(threads, args):
+    """Requests/s the dashboards meant to make: 1/poll each, or 1/mean hinted wait."""
+    if args.fixed_poll:
+        return len(threads) / args.poll
+    return sum(len(t.waits) / sum(t.waits) if t.waits else 1 / args.poll for t in threads)
+
+
+def is_saturated(result, args):
+    falling_behind = result["throughput"] < 0.9 * result["expected"]
+    return (falling_behind
+            or result["p99"] > args.p99_slo
+            or result["error_rate"] > args.max_error_rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate polling dashboards against Mr. Predictor")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--dashboards", default="10",
+                        help="dashboard count, or a comma-separated ramp, e.g. 10,50,100")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per step")
+    parser.add_argument("--poll", type=float, default=5,
+                        help="seconds between polls without a server hint, or always with --fixed-poll")
+    parser.add_argument("--fixed-poll", action="store_true",
+                        help="ignore next_refresh_ms and poll every --poll seconds (the old page)")
+    parser.add_argument("--switch-prob", type=float, default=0.05,
+                        help="chance per poll of switching ticker or timeframe")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--p99-slo", type=float, default=1000, help="p99 latency budget in ms")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    control = Client(args.url, args.timeout)
+    tickers = [s["ticker"] for stocks in control.get_json("/api/stocks").values() for s in stocks]
+    control.close()
+
+    print(f"{'dash':>6} {'reqs':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'errors':>7} {'upstream':>9}")
+    saturated_at = None
+    for step, dashboards in enumerate(int(n) for n in args.dashboards.split(",")):
+        result = run_step(args, tickers, dashboards, args.seed + step * 100_000)
+        if step == 0 and result["data_source"] != "synthetic":
+            print(f"warning: server data source is {result['data_source']!r}, not 'synthetic'")
+        print(f"{result['dashboards']:>6} {result['requests']:>7} {result['throughput']:>8.1f} "
+              f"{result['p50']:>8.1f} {result['p95']:>8.1f} {result['p99']:>8.1f} "
+              f"{result['error_rate']:>7.2%} {result['upstream_calls']:>9}")
+        if saturated_at is None and is_saturated(result, args):
+            saturated_at = dashboards
+
+    if saturated_at is None:
+        print("No saturation observed in this ramp.")
+    else:
+        print(f"Saturated at {saturated_at} dashboards "
+              f"(throughput below 90% of demand, p99 over {args.p99_slo:.0f} ms, "
+              f"or errors over {args.max_error_rate:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,136 @@
-def sliding_window_prediction(prices, no_pre):
-    window_size = 5
+import argparse
+import csv
+import functools
+import itertools
+import os
+import sys
+from multiprocessing import Pool
+
+# Below this many series the pool's startup costs more than it saves
+PARALLEL_THRESHOLD = 256
+
+
+def sliding_window_prediction(prices, no_pre, window_size=5):
     predictions = []
 
     for i in range(no_pre):
-        window = prices[-window_size:]            
-        prediction = sum(window) / len(window)    
-        predictions.append(prediction)            
-        prices.append(prediction)             
+        window = prices[-window_size:]
+        prediction = sum(window) / len(window)
+        predictions.append(prediction)
+        prices.append(prediction)
 
     return predictions
 
-prices = [110, 103, 109, 110, 145]
-while(True):
-    n = input("Enter number of future predictions: ")
+
+def positive_int(value):
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def read_lines(stream):
+    for lineno, line in enumerate(stream, 1):
+        if line.strip() and not line.startswith('#'):
+            yield lineno, line
+
+
+def is_header(line):
+    # A header row has no numeric field at all; a broken data row still has some
+    for field in next(csv.reader([line])):
+        try:
+            float(field)
+            return False
+        except ValueError:
+            pass
+    return True
+
+
+def parse_series(line):
+    # One series per line: SYMBOL,price1,price2,...  (ValueError on a non-numeric price)
+    row = next(csv.reader([line]))
+    return row[0].strip(), [float(v) for v in row[1:] if v.strip()]
+
+
+def forecast_line(item, window_size, no_pre):
+    # Parsing happens here so the parent process only reads raw lines
+    lineno, line = item
     try:
-        no_pre = int(n)
-        predicted_prices = sliding_window_prediction(prices, no_pre)
-        print(predicted_prices)
-    except:
-        if n == 'exit':
-            break
+        symbol, prices = parse_series(line)
+    except ValueError as e:
+        return lineno, None, str(e)
+    if not prices:
+        return lineno, None, "no prices"
+    return lineno, symbol, sliding_window_prediction(prices, no_pre, window_size)
+
+
+def run_batch(args):
+    source = sys.stdin if args.input == '-' else open(args.input, newline='')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    writer = csv.writer(sink)
+    forecast = functools.partial(forecast_line, window_size=args.window, no_pre=args.horizon)
+
+    lines = read_lines(source)
+    # Only the first non-comment row may be a header
+    first = next(lines, None)
+    if first is not None and not is_header(first[1]):
+        lines = itertools.chain([first], lines)
+    head = list(itertools.islice(lines, PARALLEL_THRESHOLD))
+    lines = itertools.chain(head, lines)
+
+    bad_rows = 0
+    pool = None
+    if args.workers > 1 and len(head) == PARALLEL_THRESHOLD:
+        pool = Pool(args.workers)
+
+    try:
+        if pool is not None:
+            # imap keeps input order and hands results back as they finish
+            results = pool.imap(forecast, lines, chunksize=args.chunksize)
         else:
-            print("Error")
+            results = map(forecast, lines)
+
+        for lineno, symbol, result in results:
+            if symbol is not None:
+                writer.writerow([symbol] + result)
+            else:
+                bad_rows += 1
+                print(f"line {lineno}: skipped ({result})", file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return bad_rows
+
+
+def interactive():
+    prices = [110, 103, 109, 110, 145]
+    while(True):
+        n = input("Enter number of future predictions: ")
+        try:
+            no_pre = int(n)
+            predicted_prices = sliding_window_prediction(prices, no_pre)
+            print(predicted_prices)
+        except:
+            if n == 'exit':
+                break
+            else:
+                print("Error")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 1:
+        interactive()
+    else:
+        parser = argparse.ArgumentParser(description="Sliding-window forecasts for many price series")
+        parser.add_argument('input', help="CSV file with one SYMBOL,price,... row per series ('-' for stdin)")
+        parser.add_argument('-o', '--output', default='-', help="output CSV file (default: stdout)")
+        parser.add_argument('-w', '--window', type=positive_int, default=5, help="window size (default: 5)")
+        parser.add_argument('-n', '--horizon', type=positive_int, default=1, help="predictions per series (default: 1)")
+        parser.add_argument('-j', '--workers', type=positive_int, default=os.cpu_count() or 1,
+                            help="worker processes for large inputs (default: all cores)")
+        parser.add_argument('--chunksize', type=positive_int, default=64, help="series per worker task")
+        sys.exit(1 if run_batch(parser.parse_args()) else 0)
@@ -0,0 +1,109 @@
+"""StockIndex ranking and latency over a generated 10k-symbol listing."""
+
+import importlib.util
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+import pytest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Mr Predictor.py")
+
+WORDS = ["american", "global", "first", "united", "national", "pacific", "energy", "capital",
+         "financial", "health", "medical", "systems", "technologies", "pharmaceuticals", "bancorp",
+         "resources", "industries", "international", "solutions", "partners", "realty", "networks",
+         "therapeutics", "biosciences", "semiconductor", "software", "mining", "gold", "power",
+         "foods", "brands", "retail", "motors", "insurance", "communications"]
+SUFFIXES = ["Inc", "Inc.", "Corp", "Corporation", "Ltd", "Holdings Inc", "Co", "plc", "Group Inc", "ETF"]
+
+# Queries a dashboard user types all the time: single letters, common name
+# tokens, a multi-word name and a typo that falls back to the fuzzy walk
+COMMON_QUERIES = ["s", "a", "inc", "corp", "corporation", "holdings inc", "gold mining", "corporaton"]
+LATENCY_TARGET = 0.001
+
+
+def load_app():
+    spec = importlib.util.spec_from_file_location("mr_predictor", APP_PATH)
+    app = importlib.util.module_from_spec(spec)
+    sys.modules["mr_predictor"] = app
+    spec.loader.exec_module(app)
+    return app
+
+
+def listing(n, seed=0):
+    rng = random.Random(seed)
+    seen, rows = set(), []
+    while len(rows) < n:
+        ticker = "".join(rng.choices(string.ascii_uppercase, k=rng.choice([1, 2, 3, 3, 4, 4, 4, 5])))
+        if rng.random() < 0.03:
+            ticker += rng.choice([".A", ".B", "-P"])
+        if ticker in seen:
+            continue
+        seen.add(ticker)
+        words = rng.sample(WORDS, rng.choice([1, 2, 2, 3]))
+        name = " ".join(w.capitalize() for w in words) + " " + rng.choice(SUFFIXES)
+        rows.append((ticker, name, rng.choice(["NASDAQ", "NYSE", "AMEX"])))
+    return rows
+
+
+@pytest.fixture(scope="module")
+def index():
+    app = load_app()
+    index = app.StockIndex()
+    for ticker, name, category in listing(10_000):
+        index.add(ticker, name, category)
+    index.add("AAPL", "Apple Inc.", "NASDAQ")
+    index.rank_entries()
+    return index
+
+
+def tickers(results):
+    return [entry["ticker"] for entry in results]
+
+
+def test_exact_ticker_ranks_first(index):
+    total, results = index.search("aapl")
+    assert total >= 1
+    assert tickers(results)[0] == "AAPL"
+
+
+def test_ticker_prefix_matches_come_before_name_matches(index):
+    total, results = index.search("s", limit=50)
+    assert total > 50
+    ranked = tickers(results)
+    ticker_hits = [t for t in ranked if t.lower().startswith("s")]
+    assert ranked[:len(ticker_hits)] == ticker_hits
+    assert ticker_hits == sorted(ticker_hits, key=lambda t: (len(t), t))
+
+
+def test_pages_do_not_overlap(index):
+    total, first = index.search("inc", limit=20)
+    _, second = index.search("inc", limit=20, offset=20)
+    assert total > 40
+    assert not set(tickers(first)) & set(tickers(second))
+
+
+def test_offset_past_the_end_is_clamped(index):
+    total, results = index.search("corp", limit=20, offset=10 ** 9)
+    assert total > 0
+    assert results == []
+
+
+def test_typo_falls_back_to_fuzzy(index):
+    total, results = index.search("corporaton")
+    assert total > 0
+    assert all("corporation" in entry["name"].lower() for entry in results)
+
+
+@pytest.mark.parametrize("query", COMMON_QUERIES)
+def test_common_queries_are_sub_millisecond(index, query):
+    index.search(query)
+    samples = []
+    for _ in range(50):
+        start = time.perf_counter()
+        index.search(query, 20, 0)
+        samples.append(time.perf_counter() - start)
+    assert statistics.median(samples) < LATENCY_TARGET
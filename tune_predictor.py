@@ -0,0 +1,253 @@
+"""
+Mr. Predictor - Walk-Forward Parameter Tuning
+================================================
+Searches MarketEngine.predict parameters (window, momentum, vol_cap, band)
+per ticker/interval and writes the winners to the engine's params file.
+
+Every candidate is scored on every bar at once with numpy; ticker/interval
+jobs run in parallel processes. The parameters written are the best over the
+full history. Their reported error is walk-forward: the history is cut into
+consecutive segments, the same selection is re-run on everything before a
+segment and scored on that segment, so the error is out-of-sample. An override
+is only written when that error beats the defaults' on the same segments;
+otherwise the entry is removed and the engine keeps DEFAULT_PREDICT_PARAMS.
+
+Run: python tune_predictor.py --intervals 1h,1d --search grid
+     MR_PREDICTOR_DATA_SOURCE=synthetic python tune_predictor.py   (offline)
+     python tune_predictor.py --history export.csv                 (bars from /api/export)
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Mr Predictor.py")
+
+GRID = {
+    "window": [5, 8, 10, 12, 15, 20, 25, 30, 40],
+    "momentum": np.linspace(0.0, 3.0, 16),
+    "vol_cap": np.linspace(0.1, 2.0, 12),
+}
+BANDS = np.linspace(0.0, 2.0, 41)
+# Miscoverage level for the interval score used to pick the band
+BAND_ALPHA = 0.2
+
+_app = None
+
+
+def load_app():
+    global _app
+    if _app is None:
+        spec = importlib.util.spec_from_file_location("mr_predictor", APP_PATH)
+        _app = importlib.util.module_from_spec(spec)
+        sys.modules["mr_predictor"] = _app
+        spec.loader.exec_module(_app)
+    return _app
+
+
+def candidates(search, samples, seed):
+    """Return {window: (momentum[], vol_cap[])} with paired candidate arrays."""
+    if search == "grid":
+        m, c = np.meshgrid(GRID["momentum"], GRID["vol_cap"], indexing="ij")
+        return {w: (m.ravel(), c.ravel()) for w in GRID["window"]}
+
+    rng = np.random.default_rng(seed)
+    windows = rng.integers(3, 61, samples)
+    momentum = rng.uniform(0.0, 3.0, samples)
+    vol_cap = rng.uniform(0.1, 2.0, samples)
+    return {int(w): (momentum[windows == w], vol_cap[windows == w]) for w in np.unique(windows)}
+
+
+def window_features(o, h, l, c, window):
+    """Momentum and volatility exactly as predict() computes them, for every bar."""
+    weights = np.linspace(0.1, 1.0, window)
+    momentum = np.correlate(c - o, weights, mode="valid") / weights.sum()
+    ranges = np.concatenate(([0.0], np.cumsum(h - l)))
+    volatility = (ranges[window:] - ranges[:-window]) / window
+    return momentum, volatility
+
+
+def aligned_features(o, h, l, c, window, warmup):
+    """Features for predicting bars warmup..n-1, using the close before each as the start price."""
+    momentum, volatility = window_features(o, h, l, c, window)
+    # Feature j covers bars [j, j + window); keep those whose next bar is >= warmup
+    first = warmup - window
+    return momentum[first:-1], volatility[first:-1], c[warmup - 1:-1]
+
+
+def predicted_close(momentum, volatility, start, mom_mult, caps):
+    limit = volatility * caps
+    return start + np.clip(momentum * mom_mult, -limit, limit)
+
+
+def segment_starts(n, folds):
+    return np.linspace(0, n, folds + 2).astype(int)[:-1]
+
+
+def walk_forward(seg_err, seg_count):
+    """Pick the best in-sample candidate before each later segment; return its mean error there."""
+    in_err = np.cumsum(seg_err, axis=1)
+    in_count = np.cumsum(seg_count)
+    oos_err = 0.0
+    for k in range(1, seg_err.shape[1]):
+        best = int(np.argmin(in_err[:, k - 1] / in_count[k - 1]))
+        oos_err += seg_err[best, k]
+    return oos_err / seg_count[1:].sum()
+
+
+def tune_band(o, h, l, c, best, warmup):
+    window, mom_mult, cap = best
+    momentum, volatility, start = aligned_features(o, h, l, c, window, warmup)
+    pred = predicted_close(momentum, volatility, start, mom_mult, cap)
+
+    band = volatility * BANDS[:, None]
+    upper = np.maximum(start, pred) + band
+    lower = np.minimum(start, pred) - band
+    hi, lo = h[warmup:], l[warmup:]
+    # Interval score: width plus a 2/alpha penalty for how far the bar escaped the band
+    score = (upper - lower
+             + (2 / BAND_ALPHA) * np.maximum(hi - upper, 0)
+             + (2 / BAND_ALPHA) * np.maximum(lower - lo, 0)) / start
+    return float(BANDS[int(np.argmin(score.mean(axis=1)))])
+
+
+def tune_series(o, h, l, c, space, folds, min_bars):
+    default = load_app().DEFAULT_PREDICT_PARAMS
+    space = dict(space)
+    # The current parameters compete as a candidate and serve as the baseline
+    mom_mult, caps = space.get(default["window"], (np.empty(0), np.empty(0)))
+    space[default["window"]] = (np.r_[default["momentum"], mom_mult], np.r_[default["vol_cap"], caps])
+
+    # Every window is scored on the same target bars so errors are comparable
+    warmup = max(space)
+    n = len(c) - warmup
+    if n < max(min_bars, folds + 1):
+        return None
+    starts = segment_starts(n, folds)
+    seg_count = np.diff(np.r_[starts, n])
+    target = c[warmup:]
+
+    rows, seg_err = [], []
+    for window, (mom_mult, caps) in space.items():
+        if len(mom_mult) == 0:
+            continue
+        momentum, volatility, start = aligned_features(o, h, l, c, window, warmup)
+        pred = predicted_close(momentum, volatility, start, mom_mult[:, None], caps[:, None])
+        err = np.abs(pred - target) / start
+        seg_err.append(np.add.reduceat(err, starts, axis=1))
+        if window == default["window"]:
+            baseline = len(rows)
+        rows.extend((window, float(m), float(v)) for m, v in zip(mom_mult, caps))
+
+    seg_err = np.vstack(seg_err)
+    best = rows[int(np.argmin(seg_err.sum(axis=1)))]
+    return {
+        "window": best[0],
+        "momentum": round(best[1], 4),
+        "vol_cap": round(best[2], 4),
+        "band": round(tune_band(o, h, l, c, best, warmup), 4),
+        "oos_error": float(walk_forward(seg_err, seg_count)),
+        "default_oos_error": float(seg_err[baseline, 1:].sum() / seg_count[1:].sum()),
+        "candidates": len(rows),
+        "bars": int(len(c)),
+    }
+
+
+def load_export(path):
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    if "error" in df.columns:
+        for row in df[df["error"].notna()].itertuples():
+            print(f"{row.ticker:>10} {row.interval:>3}  skipped ({row.error} in export)")
+        df = df[df["error"].isna()]
+    series = {}
+    for (ticker, interval), group in df.groupby(["ticker", "interval"], sort=False):
+        group = group.sort_values("time")
+        series[(ticker, interval)] = tuple(group[k].to_numpy(dtype=np.float64)
+                                           for k in ("open", "high", "low", "close"))
+    return series
+
+
+def run_job(ticker, interval, bars, space, folds, min_bars):
+    if bars is None:
+        app = load_app()
+        history = app.get_engine().get_history(ticker, interval, app.EXPORT_PERIOD[interval])
+        history = history.dropna()
+        bars = tuple(np.asarray(a, dtype=np.float64) for a in (history.open, history.high, history.low, history.close))
+    return ticker, interval, tune_series(*bars, space, folds, min_bars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward tuning of MarketEngine.predict parameters")
+    parser.add_argument("--tickers", help="comma-separated tickers (default: every STOCK_LIST ticker)")
+    parser.add_argument("--intervals", default="1h,1d")
+    parser.add_argument("--history", help="CSV from /api/export to tune on instead of downloading")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=2000, help="candidates for random search")
+    parser.add_argument("--folds", type=int, default=4, help="walk-forward out-of-sample segments")
+    parser.add_argument("--min-bars", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="params file to update (default: the engine's PARAMS_FILE)")
+    args = parser.parse_args()
+
+    app = load_app()
+    output = args.output or app.PARAMS_FILE
+    space = candidates(args.search, args.samples, args.seed)
+
+    if args.history:
+        jobs = [(t, i, bars) for (t, i), bars in load_export(args.history).items()]
+    else:
+        if args.tickers:
+            tickers = [t.strip().upper() for t in args.tickers.split(",") if t.strip()]
+        else:
+            tickers = [s["ticker"] for stocks in app.STOCK_LIST.values() for s in stocks]
+        intervals = [i.strip() for i in args.intervals.split(",") if i.strip()]
+        jobs = [(t, i, None) for t in tickers for i in intervals]
+
+    tuned = {}
+    if os.path.exists(output):
+        with open(output) as f:
+            tuned = json.load(f)
+
+    print("oos = walk-forward error of re-selecting before each segment; "
+          "the parameters shown are the full-history selection")
+    started = time.perf_counter()
+    total_candidates = 0
+    written = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(run_job, t, i, bars, space, args.folds, args.min_bars) for t, i, bars in jobs]
+        for future in as_completed(futures):
+            ticker, interval, result = future.result()
+            if result is None:
+                print(f"{ticker:>10} {interval:>3}  skipped (not enough history)")
+                continue
+            total_candidates += result["candidates"]
+            if result["oos_error"] >= result["default_oos_error"]:
+                tuned.get(ticker, {}).pop(interval, None)
+                if ticker in tuned and not tuned[ticker]:
+                    del tuned[ticker]
+                print(f"{ticker:>10} {interval:>3}  kept defaults: oos={result['oos_error']:.5f} "
+                      f"does not beat default {result['default_oos_error']:.5f}")
+                continue
+            written += 1
+            tuned.setdefault(ticker, {})[interval] = result
+            print(f"{ticker:>10} {interval:>3}  window={result['window']:<3} momentum={result['momentum']:<6} "
+                  f"vol_cap={result['vol_cap']:<6} band={result['band']:<5} "
+                  f"oos={result['oos_error']:.5f} (default {result['default_oos_error']:.5f})")
+
+    with open(output, "w") as f:
+        json.dump(tuned, f, indent=2, sort_keys=True)
+    print(f"Evaluated {total_candidates} candidates over {len(jobs)} series "
+          f"in {time.perf_counter() - started:.1f}s; {written} overrides written -> {output}")
+
+
+if __name__ == "__main__":
+    main()